@@ -1,7 +1,21 @@
 import streamlit as st
 import pandas as pd
+import polars as pl
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
+import numexpr
+import pyarrow.feather as feather
+from collections import namedtuple
+from pathlib import Path
+from numba import njit
+from tsdownsample import LTTBDownsampler
+
+# Copy-on-write lets the filter pipeline start from a plain reference to
+# the loaded frame instead of a full defensive copy. pandas 3 always runs
+# with it; opt in explicitly on pandas 2.x.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
 
 # --- Streamlit Page Configuration ---
 # THIS MUST BE THE ABSOLUTE FIRST STREAMLIT COMMAND IN YOUR SCRIPT
@@ -11,23 +25,111 @@ st.set_page_config(
     layout="wide"
 )
 
+# Struct-of-arrays view of the filter columns: one contiguous numpy array
+# per column, with the string columns represented by their category codes.
+# The sidebar predicates run directly on these arrays and only touch the
+# DataFrame for the final row gather.
+FilterColumns = namedtuple('FilterColumns', [
+    'dates', 'sales', 'quantity', 'discount', 'profit',
+    'region', 'category', 'sub_category', 'segment', 'ship_mode', 'state', 'city',
+])
+
 # --- Load Data (Now reads from your_data.csv) ---
-@st.cache_data
-@st.cache_data
-@st.cache_data
+@st.cache_resource
 def load_data():
+    # cache_resource keeps one process-global copy of the dataset shared
+    # by every user session, instead of a pickled copy per session;
+    # nothing downstream mutates the frame, so sharing is safe.
     try:
-        # Load your data from a CSV file
-        df = pd.read_csv("Sample - Superstore.csv", encoding='ISO-8859-1')
-
-        # Ensure 'Order Date' and 'Ship Date' are datetime objects
-        df['Order Date'] = pd.to_datetime(df['Order Date'], errors='coerce')
-        df['Ship Date'] = pd.to_datetime(df['Ship Date'], errors='coerce')
-
-        # Drop rows with invalid dates
-        df.dropna(subset=['Order Date', 'Ship Date'], inplace=True)
+        # Run the full preprocessing pipeline once and persist the result
+        # as an Arrow IPC (Feather) file. On later process starts the file
+        # is memory-mapped back with near-zero parse time, dtypes included.
+        ipc_path = Path("Sample - Superstore.arrow")
+        if not ipc_path.exists():
+            # One-time conversion using Polars (multithreaded Rust CSV
+            # reader). The dates are in m/d/Y format, so parse them
+            # explicitly; strict=False maps bad values to null, mirroring
+            # pd.to_datetime(errors='coerce').
+            df = (
+                pl.read_csv(
+                    "Sample - Superstore.csv",
+                    encoding='ISO-8859-1',
+                    infer_schema_length=2000,
+                )
+                .with_columns(
+                    pl.col('Order Date').str.to_datetime('%m/%d/%Y', strict=False),
+                    pl.col('Ship Date').str.to_datetime('%m/%d/%Y', strict=False),
+                )
+                .to_pandas()
+            )
+
+            # Drop rows with invalid dates
+            df.dropna(subset=['Order Date', 'Ship Date'], inplace=True)
+
+            # Low-cardinality string columns are hit with
+            # unique()/isin()/groupby on every rerun; as category dtype
+            # those ops run on small integer codes instead of strings,
+            # and memory use drops sharply.
+            categorical_cols = [
+                'Region', 'Category', 'Sub-Category', 'Segment',
+                'Ship Mode', 'State', 'City', 'Country',
+            ]
+            for c in categorical_cols:
+                df[c] = df[c].astype('category')
+
+            # Downcast the numeric columns as well: the money values sit
+            # well within float32 precision, and halving the bytes per
+            # element halves the memory traffic of every filter and sum.
+            df['Quantity'] = df['Quantity'].astype('int16')
+            df[['Sales', 'Profit', 'Discount']] = df[['Sales', 'Profit', 'Discount']].astype('float32')
+
+            # Keep rows sorted by Order Date so the date-range filter can
+            # binary-search its endpoints and take a contiguous slice
+            # instead of scanning the whole column for a boolean mask.
+            df = df.sort_values('Order Date').reset_index(drop=True)
+
+            # Precompute each row's month ordinal (months since epoch)
+            # for the sales-trend chart; the monthly_sum kernel
+            # accumulates over these integers directly.
+            df['_month_idx'] = (
+                df['Order Date'].values.astype('datetime64[M]').view('i8').astype(np.int32)
+            )
+
+            # Prebuild the hover string for the Sales vs. Profit scatter,
+            # so per-rerun hover work is just handing off this array.
+            df['_hover'] = (
+                df['Product Name'].astype(str)
+                + '<br>' + df['Customer Name'].astype(str)
+                + '<br>' + df['Order ID'].astype(str)
+                + '<br>' + df['Order Date'].dt.strftime('%Y-%m-%d')
+            )
+
+            df.to_feather(ipc_path)
+
+        df = feather.read_table(ipc_path, memory_map=True).to_pandas()
+
+        # Parent -> child option lookups for the cascading filters, built
+        # once here so the sidebar does dict lookups per selected parent
+        # instead of rescanning the filtered frame on every rerun.
+        cat_to_sub = df.groupby('Category', observed=True)['Sub-Category'].unique().apply(list).to_dict()
+        state_to_city = df.groupby('State', observed=True)['City'].unique().apply(list).to_dict()
+
+        cols = FilterColumns(
+            dates=df['Order Date'].to_numpy(),
+            sales=df['Sales'].to_numpy(),
+            quantity=df['Quantity'].to_numpy(),
+            discount=df['Discount'].to_numpy(),
+            profit=df['Profit'].to_numpy(),
+            region=df['Region'].cat.codes.to_numpy(),
+            category=df['Category'].cat.codes.to_numpy(),
+            sub_category=df['Sub-Category'].cat.codes.to_numpy(),
+            segment=df['Segment'].cat.codes.to_numpy(),
+            ship_mode=df['Ship Mode'].cat.codes.to_numpy(),
+            state=df['State'].cat.codes.to_numpy(),
+            city=df['City'].cat.codes.to_numpy(),
+        )
 
-        return df
+        return df, cols, cat_to_sub, state_to_city
     except FileNotFoundError:
         return None
     except Exception as e:
@@ -35,19 +137,205 @@ def load_data():
         return None
 
 # Load the data
-df = load_data()
+loaded = load_data()
 
 # Handle case where data loading might have failed.
 # This check is performed *after* set_page_config is safely called.
-if df is None:
-    # If df is None, it means load_data failed and an error message was shown there.
+if loaded is None:
+    # If loaded is None, it means load_data failed and an error message was shown there.
     # We stop the app execution here.
     st.stop()
-elif df.empty:
+
+df, cols, cat_to_sub, state_to_city = loaded
+
+# Label -> code lookup per filterable column, for translating multiselect
+# selections into the code space of the arrays in `cols`.
+cat_index = {
+    c: df[c].cat.categories
+    for c in ['Region', 'Category', 'Sub-Category', 'Segment', 'Ship Mode', 'State', 'City']
+}
+
+if df.empty:
     st.warning("The loaded dataset is empty or contains no valid data after processing. Please check your CSV file.")
     st.stop()
 
 
+# Option lists for the sidebar widgets never change between reruns, so
+# compute each one once per column instead of rescanning the full column
+# on every slider drag.
+@st.cache_data
+def get_unique(col):
+    return df[col].unique().tolist()
+
+# Cap on scatter points drawn per category; beyond this the figure takes
+# seconds to serialize and the browser stalls on overdraw.
+SCATTER_MAX_POINTS = 2000
+
+def downsample_scatter(frame, n_out=SCATTER_MAX_POINTS):
+    # Reduce each category's point cloud with LTTB (largest-triangle-
+    # three-buckets) along the Sales axis. The downsampled set keeps the
+    # visual envelope of the full scatter with far fewer points.
+    if len(frame) <= n_out:
+        return frame
+    keep = []
+    for _, grp in frame.groupby('Category', observed=True):
+        if len(grp) <= n_out:
+            keep.append(grp.index.to_numpy())
+            continue
+        ordered = grp.sort_values('Sales')
+        idx = LTTBDownsampler().downsample(
+            ordered['Sales'].to_numpy(dtype='float64'),
+            ordered['Profit'].to_numpy(dtype='float64'),
+            n_out=n_out,
+        )
+        keep.append(ordered.index.to_numpy()[idx])
+    return frame.loc[np.concatenate(keep)]
+
+@njit(cache=True)
+def monthly_sum(month_idx, sales, lo, hi):
+    # Dense single-pass accumulation of sales into month buckets. The
+    # month ordinals are precomputed at load time, so this is a plain
+    # integer-indexed loop that Numba compiles to machine code — no
+    # hashing, no datetime conversions.
+    out = np.zeros(hi - lo + 1, dtype=np.float64)
+    for i in range(month_idx.size):
+        out[month_idx[i] - lo] += sales[i]
+    return out
+
+@st.cache_data
+def build_figures(_frame, filter_key):
+    # _frame is excluded from hashing (leading underscore); filter_key is
+    # the tuple of every active filter value and fully determines the
+    # frame's contents, so it alone keys the cache. A rerun that leaves
+    # the filters untouched gets every figure back without recomputing.
+
+    # Monthly trend: dense accumulation over the precomputed month
+    # ordinals via the Numba kernel. Empty months come out as true
+    # zeros, matching what a calendar resample would produce.
+    month_idx = _frame['_month_idx'].to_numpy()
+    lo_m, hi_m = int(month_idx.min()), int(month_idx.max())
+    sales_over_time = pd.DataFrame({
+        'Order Date': np.arange(lo_m, hi_m + 1).astype('datetime64[M]'),
+        'Sales': monthly_sum(month_idx, _frame['Sales'].to_numpy(), lo_m, hi_m),
+    })
+
+    # The remaining chart-backing aggregations are expressed lazily
+    # against one Polars frame and collected together, so the filtered
+    # data is traversed once for all five queries instead of per chart.
+    lf = pl.from_pandas(
+        _frame[['Category', 'Sub-Category', 'Region',
+                'Segment', 'State', 'Sales', 'Profit']]
+    ).lazy()
+    agg_results = pl.collect_all([
+        lf.group_by('Category').agg(pl.sum('Sales')).sort('Sales', descending=True),
+        lf.group_by('Sub-Category').agg(pl.sum('Profit')).sort('Profit', descending=True),
+        lf.group_by('Region').agg(pl.sum('Sales')),
+        lf.group_by('Segment').agg(pl.sum('Sales')),
+        lf.group_by('State').agg(pl.sum('Sales')).top_k(20, by='Sales').sort('Sales', descending=True),
+    ])
+    (sales_by_category, profit_by_sub_category,
+     sales_by_region, sales_by_segment, sales_by_state) = [r.to_pandas() for r in agg_results]
+
+    # 1. Sales Over Time
+    fig_sales_time = px.line(
+        sales_over_time,
+        x='Order Date',
+        y='Sales',
+        title='Monthly Sales Trend',
+        labels={'Order Date': 'Date', 'Sales': 'Total Sales'},
+        template="plotly_white"
+    )
+    fig_sales_time.update_traces(mode='lines+markers', marker=dict(size=6))
+    fig_sales_time.update_layout(hovermode="x unified")
+
+    # 2. Sales by Category and Sub-Category
+    # These aggregated charts hold at most a couple dozen bars, so build
+    # them with graph_objects and plain numpy arrays; this skips px's
+    # DataFrame introspection and per-point attribute expansion.
+    cat_labels = sales_by_category['Category'].astype(str).to_numpy()
+    fig_sales_category = go.Figure(go.Bar(
+        x=cat_labels,
+        y=sales_by_category['Sales'].to_numpy(),
+        marker_color=px.colors.qualitative.Plotly[:len(cat_labels)],
+    ))
+    fig_sales_category.update_layout(title='Sales by Product Category', template="plotly_white")
+
+    profit_vals = profit_by_sub_category['Profit'].to_numpy()
+    fig_profit_sub_category = go.Figure(go.Bar(
+        x=profit_by_sub_category['Sub-Category'].astype(str).to_numpy(),
+        y=profit_vals,
+        marker=dict(
+            color=profit_vals, # Color by profit value
+            colorscale="RdYlGn",
+            colorbar=dict(title='Profit'),
+        ),
+    ))
+    fig_profit_sub_category.update_layout(title='Profit by Product Sub-Category', template="plotly_white")
+
+    # 3. Sales vs. Profit Scatter Plot
+    # Scattergl renders the whole trace as one WebGL draw call instead of
+    # one SVG DOM node per point, which keeps the browser responsive on
+    # large filtered frames. One trace per category preserves the legend
+    # and color mapping; hover text was prebuilt at load time.
+    scatter_df = downsample_scatter(_frame)
+    fig_scatter = go.Figure()
+    for i, (cat, grp) in enumerate(scatter_df.groupby('Category', observed=True)):
+        fig_scatter.add_trace(go.Scattergl(
+            x=grp['Sales'].to_numpy(),
+            y=grp['Profit'].to_numpy(),
+            mode='markers',
+            name=str(cat),
+            marker=dict(color=px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)]),
+            text=grp['_hover'].to_numpy(),
+        ))
+    fig_scatter.update_layout(
+        title='Sales vs. Profit',
+        xaxis_title='Sales Amount',
+        yaxis_title='Profit Amount',
+        template="plotly_white"
+    )
+
+    # 4. Sales by Region and Segment
+    fig_sales_region = go.Figure(go.Pie(
+        labels=sales_by_region['Region'].astype(str).to_numpy(),
+        values=sales_by_region['Sales'].to_numpy(),
+        hole=0.3, # Donut chart
+        textposition='inside',
+        textinfo='percent+label',
+    ))
+    fig_sales_region.update_layout(title='Sales Distribution by Region', template="plotly_white")
+
+    seg_labels = sales_by_segment['Segment'].astype(str).to_numpy()
+    fig_sales_segment = go.Figure(go.Bar(
+        x=seg_labels,
+        y=sales_by_segment['Sales'].to_numpy(),
+        marker_color=px.colors.qualitative.Plotly[:len(seg_labels)],
+    ))
+    fig_sales_segment.update_layout(title='Sales by Customer Segment', template="plotly_white")
+
+    # 5. Sales by State
+    state_sales = sales_by_state['Sales'].to_numpy()
+    fig_sales_state = go.Figure(go.Bar(
+        x=sales_by_state['State'].astype(str).to_numpy(),
+        y=state_sales,
+        marker=dict(
+            color=state_sales,
+            colorscale="Plasma",
+            colorbar=dict(title='Sales'),
+        ),
+    ))
+    fig_sales_state.update_layout(title='Top 20 States by Sales', template="plotly_white")
+
+    return {
+        'sales_time': fig_sales_time,
+        'sales_category': fig_sales_category,
+        'profit_sub_category': fig_profit_sub_category,
+        'scatter': fig_scatter,
+        'sales_region': fig_sales_region,
+        'sales_segment': fig_sales_segment,
+        'sales_state': fig_sales_state,
+    }
+
 # --- Title and Description ---
 st.title("📈 Interactive Sales Dashboard")
 st.markdown("Explore your sales data with interactive filters and visualizations.")
@@ -55,8 +343,23 @@ st.markdown("Explore your sales data with interactive filters and visualizations
 # --- Sidebar Filters ---
 st.sidebar.header("Filter Options")
 
-# Initialize a mutable copy of the DataFrame for filtering
-df_filtered = df.copy()
+# Each widget contributes one boolean predicate over the raw column
+# arrays in `cols`; the DataFrame itself is touched only once, by the
+# final row gather after all widgets have run.
+filter_masks = []
+
+def combine_masks(masks, n_rows):
+    # AND all collected predicates into one boolean array; with no active
+    # predicates every row passes.
+    if not masks:
+        return np.ones(n_rows, dtype=bool)
+    return np.logical_and.reduce(masks)
+
+def cat_isin(codes, categories, selected):
+    # isin on a code array: resolve the selected labels to their integer
+    # codes once, then test membership on the contiguous codes instead of
+    # hashing a string per row.
+    return np.isin(codes, categories.get_indexer(selected))
 
 # Date Range Filter
 # Ensure min_date and max_date are only calculated if df is not empty
@@ -74,7 +377,11 @@ selected_dates = st.sidebar.slider(
     value=(min_date, max_date),
     format="YYYY-MM-DD"
 )
-df_filtered = df_filtered[(df_filtered['Order Date'] >= selected_dates[0]) & (df_filtered['Order Date'] <= selected_dates[1])]
+# Order Date is sorted at load time, so the selected range resolves to a
+# contiguous row span found by binary search; the remaining predicates
+# run on the (usually much smaller) [lo:hi] slices of the column arrays.
+lo = np.searchsorted(cols.dates, np.datetime64(selected_dates[0]))
+hi = np.searchsorted(cols.dates, np.datetime64(selected_dates[1]), side='right')
 
 
 # IMPORTANT: Define options based on the original df or the current state of df_filtered if you want true cascading
@@ -83,98 +390,114 @@ df_filtered = df_filtered[(df_filtered['Order Date'] >= selected_dates[0]) & (df
 
 # Multi-select filters for categorical data
 # Regions
-all_regions = df['Region'].unique()
+all_regions = get_unique('Region')
 selected_regions = st.sidebar.multiselect(
     "Select Region(s)",
     options=all_regions,
-    default=list(all_regions) if all_regions.size > 0 else [] # Convert numpy array to list for default
+    default=all_regions
 )
-if selected_regions:
-    df_filtered = df_filtered[df_filtered['Region'].isin(selected_regions)]
+# A full selection matches 100% of rows (the default view), so only run
+# the membership scan when the user has actually narrowed the options.
+if selected_regions and len(selected_regions) < len(all_regions):
+    filter_masks.append(cat_isin(cols.region[lo:hi], cat_index['Region'], selected_regions))
 
 # Categories
-all_categories = df['Category'].unique()
+all_categories = get_unique('Category')
 selected_categories = st.sidebar.multiselect(
     "Select Category(ies)",
     options=all_categories,
-    default=list(all_categories) if all_categories.size > 0 else []
+    default=all_categories
 )
-if selected_categories:
-    df_filtered = df_filtered[df_filtered['Category'].isin(selected_categories)]
+if selected_categories and len(selected_categories) < len(all_categories):
+    filter_masks.append(cat_isin(cols.category[lo:hi], cat_index['Category'], selected_categories))
 
 # Sub-Category filter, dependent on selected Categories (cascading)
-available_sub_categories = df_filtered['Sub-Category'].unique() # Options based on current filtered_df
+# The options come from the precomputed Category -> Sub-Category lookup,
+# so no column scan runs here.
+available_sub_categories = sorted({s for c in selected_categories for s in cat_to_sub[c]})
 selected_sub_categories = st.sidebar.multiselect(
     "Select Sub-Category(ies)",
     options=available_sub_categories,
-    default=list(available_sub_categories) if available_sub_categories.size > 0 else []
+    default=available_sub_categories
 )
-if selected_sub_categories:
-    df_filtered = df_filtered[df_filtered['Sub-Category'].isin(selected_sub_categories)]
-# Check if no categories selected AND filtered_df is empty due to other filters
-elif not selected_categories and df_filtered.empty:
+# Selecting every available sub-category adds nothing beyond the Category
+# filter, since each row's sub-category belongs to its category's list.
+if selected_sub_categories and len(selected_sub_categories) < len(available_sub_categories):
+    filter_masks.append(cat_isin(cols.sub_category[lo:hi], cat_index['Sub-Category'], selected_sub_categories))
+# Check if no categories are selected, leaving nothing to cascade from
+elif not selected_categories:
     st.sidebar.warning("Please select at least one Category to filter Sub-Categories or adjust other filters.")
 # Check if no sub-categories selected but there were available options
-elif not selected_sub_categories and not available_sub_categories.size == 0:
+# (a full selection also lands here via the skip above, and is fine)
+elif not selected_sub_categories and available_sub_categories:
     st.sidebar.warning("No Sub-Categories selected. Showing no data for sub-category related charts.")
 
 
 # Segments
-all_segments = df['Segment'].unique()
+all_segments = get_unique('Segment')
 selected_segments = st.sidebar.multiselect(
     "Select Segment(s)",
     options=all_segments,
-    default=list(all_segments) if all_segments.size > 0 else []
+    default=all_segments
 )
-if selected_segments:
-    df_filtered = df_filtered[df_filtered['Segment'].isin(selected_segments)]
+if selected_segments and len(selected_segments) < len(all_segments):
+    filter_masks.append(cat_isin(cols.segment[lo:hi], cat_index['Segment'], selected_segments))
 
 # Ship Modes
-all_ship_modes = df['Ship Mode'].unique()
+all_ship_modes = get_unique('Ship Mode')
 selected_ship_modes = st.sidebar.multiselect(
     "Select Ship Mode(s)",
     options=all_ship_modes,
-    default=list(all_ship_modes) if all_ship_modes.size > 0 else []
+    default=all_ship_modes
 )
-if selected_ship_modes:
-    df_filtered = df_filtered[df_filtered['Ship Mode'].isin(selected_ship_modes)]
+if selected_ship_modes and len(selected_ship_modes) < len(all_ship_modes):
+    filter_masks.append(cat_isin(cols.ship_mode[lo:hi], cat_index['Ship Mode'], selected_ship_modes))
 
 # States
-all_states = df['State'].unique()
+all_states = get_unique('State')
 selected_states = st.sidebar.multiselect(
     "Select State(s)",
     options=all_states,
-    default=list(all_states) if all_states.size > 0 else []
+    default=all_states
 )
-if selected_states:
-    df_filtered = df_filtered[df_filtered['State'].isin(selected_states)]
+if selected_states and len(selected_states) < len(all_states):
+    filter_masks.append(cat_isin(cols.state[lo:hi], cat_index['State'], selected_states))
 
 # Cities, dependent on selected States (cascading)
-available_cities = df_filtered['City'].unique() # Options based on current filtered_df
+available_cities = sorted({c for s in selected_states for c in state_to_city[s]})
 selected_cities = st.sidebar.multiselect(
     "Select City(ies)",
     options=available_cities,
-    default=list(available_cities) if available_cities.size > 0 else []
+    default=available_cities
 )
-if selected_cities:
-    df_filtered = df_filtered[df_filtered['City'].isin(selected_cities)]
-# Check if no states selected AND filtered_df is empty due to other filters
-elif not selected_states and df_filtered.empty:
+if selected_cities and len(selected_cities) < len(available_cities):
+    filter_masks.append(cat_isin(cols.city[lo:hi], cat_index['City'], selected_cities))
+# Check if no states are selected, leaving nothing to cascade from
+elif not selected_states:
     st.sidebar.warning("Please select at least one State to filter Cities or adjust other filters.")
 # Check if no cities selected but there were available options
-elif not selected_cities and not available_cities.size == 0:
+# (a full selection also lands here via the skip above, and is fine)
+elif not selected_cities and available_cities:
     st.sidebar.warning("No Cities selected. Showing no data for city related charts.")
 
 
 # Numeric Range Filters
 # Use the full dataframe for min/max values to ensure sliders cover the entire range,
 # but apply the filter to df_filtered.
+# One agg pass visits each slider column exactly once instead of eight
+# separate min/max reductions, and the result is cached since these
+# bounds never change across reruns.
+@st.cache_data
+def get_numeric_ranges():
+    return df[['Sales', 'Quantity', 'Discount', 'Profit']].agg(['min', 'max'])
+
 # Handle potential empty dataframe for min/max calculations
 if not df.empty:
-    min_sales_overall, max_sales_overall = float(df['Sales'].min()), float(df['Sales'].max())
-    min_quantity_overall, max_quantity_overall = int(df['Quantity'].min()), int(df['Quantity'].max())
-    min_discount_overall, max_discount_overall = float(df['Discount'].min()), float(df['Discount'].max())
-    min_profit_overall, max_profit_overall = float(df['Profit'].min()), float(df['Profit'].max())
+    mm = get_numeric_ranges()
+    min_sales_overall, max_sales_overall = float(mm['Sales']['min']), float(mm['Sales']['max'])
+    min_quantity_overall, max_quantity_overall = int(mm['Quantity']['min']), int(mm['Quantity']['max'])
+    min_discount_overall, max_discount_overall = float(mm['Discount']['min']), float(mm['Discount']['max'])
+    min_profit_overall, max_profit_overall = float(mm['Profit']['min']), float(mm['Profit']['max'])
 else:
     # Set default safe values if df is empty (should ideally be handled by the df is None check)
     min_sales_overall, max_sales_overall = 0.0, 1000.0
@@ -190,8 +513,6 @@ selected_sales = st.sidebar.slider(
     value=(min_sales_overall, max_sales_overall),
     step=10.0
 )
-df_filtered = df_filtered[(df_filtered['Sales'] >= selected_sales[0]) & (df_filtered['Sales'] <= selected_sales[1])]
-
 selected_quantity = st.sidebar.slider(
     "Quantity Range",
     min_value=min_quantity_overall,
@@ -199,8 +520,6 @@ selected_quantity = st.sidebar.slider(
     value=(min_quantity_overall, max_quantity_overall),
     step=1
 )
-df_filtered = df_filtered[(df_filtered['Quantity'] >= selected_quantity[0]) & (df_filtered['Quantity'] <= selected_quantity[1])]
-
 selected_discount = st.sidebar.slider(
     "Discount Range",
     min_value=min_discount_overall,
@@ -208,8 +527,6 @@ selected_discount = st.sidebar.slider(
     value=(min_discount_overall, max_discount_overall),
     step=0.01
 )
-df_filtered = df_filtered[(df_filtered['Discount'] >= selected_discount[0]) & (df_filtered['Discount'] <= selected_discount[1])]
-
 selected_profit = st.sidebar.slider(
     "Profit Range",
     min_value=min_profit_overall,
@@ -217,7 +534,33 @@ selected_profit = st.sidebar.slider(
     value=(min_profit_overall, max_profit_overall),
     step=1.0
 )
-df_filtered = df_filtered[(df_filtered['Profit'] >= selected_profit[0]) & (df_filtered['Profit'] <= selected_profit[1])]
+# Fuse the four numeric range checks into one numexpr pass over the
+# column arrays; numexpr evaluates the whole expression in C without
+# materializing a boolean array per comparison.
+# Cast each bound to its column's dtype first: numexpr would otherwise
+# promote the float32 columns to float64 to match the slider scalars,
+# and e.g. a stored Discount of 0.2 widens to 0.20000000298, silently
+# excluding rows that sit exactly on a slider boundary.
+s0, s1 = (cols.sales.dtype.type(v) for v in selected_sales)
+q0, q1 = (cols.quantity.dtype.type(v) for v in selected_quantity)
+d0, d1 = (cols.discount.dtype.type(v) for v in selected_discount)
+p0, p1 = (cols.profit.dtype.type(v) for v in selected_profit)
+filter_masks.append(numexpr.evaluate(
+    "(s0 <= sales) & (sales <= s1) & (q0 <= quantity) & (quantity <= q1)"
+    " & (d0 <= discount) & (discount <= d1) & (p0 <= profit) & (profit <= p1)",
+    local_dict={
+        'sales': cols.sales[lo:hi], 'quantity': cols.quantity[lo:hi],
+        'discount': cols.discount[lo:hi], 'profit': cols.profit[lo:hi],
+        's0': s0, 's1': s1, 'q0': q0, 'q1': q1,
+        'd0': d0, 'd1': d1, 'p0': p0, 'p1': p1,
+    },
+))
+
+# Single gather from the full frame: the surviving slice-relative
+# positions, offset by the date-slice start, select rows by integer
+# position and skip pandas' per-column boolean-mask handling.
+combined_mask = combine_masks(filter_masks, hi - lo)
+df_filtered = df.take(np.flatnonzero(combined_mask) + lo)
 
 
 st.markdown("---") # Markdown for separation
@@ -245,110 +588,52 @@ else:
     st.markdown("---") # Markdown for separation
     st.subheader("Interactive Visualizations")
 
+    # One hashable key covering every active filter; the figures are
+    # cached on it, so only an actual filter change rebuilds them.
+    filter_key = (
+        selected_dates, tuple(selected_regions), tuple(selected_categories),
+        tuple(selected_sub_categories), tuple(selected_segments),
+        tuple(selected_ship_modes), tuple(selected_states),
+        tuple(selected_cities), selected_sales, selected_quantity,
+        selected_discount, selected_profit,
+    )
+    figs = build_figures(df_filtered, filter_key)
+
     # 1. Sales Over Time
     st.markdown("#### Sales Trend Over Time")
-    sales_over_time = df_filtered.groupby(pd.Grouper(key='Order Date', freq='M'))['Sales'].sum().reset_index()
-    fig_sales_time = px.line(
-        sales_over_time,
-        x='Order Date',
-        y='Sales',
-        title='Monthly Sales Trend',
-        labels={'Order Date': 'Date', 'Sales': 'Total Sales'},
-        template="plotly_white"
-    )
-    fig_sales_time.update_traces(mode='lines+markers', marker=dict(size=6))
-    fig_sales_time.update_layout(hovermode="x unified")
-    st.plotly_chart(fig_sales_time, use_container_width=True)
+    st.plotly_chart(figs['sales_time'], use_container_width=True)
 
     # 2. Sales by Category and Sub-Category
     st.markdown("#### Sales & Profit by Category and Sub-Category")
     col4, col5 = st.columns(2)
     with col4:
-        sales_by_category = df_filtered.groupby('Category')['Sales'].sum().reset_index().sort_values(by='Sales', ascending=False)
-        fig_sales_category = px.bar(
-            sales_by_category,
-            x='Category',
-            y='Sales',
-            title='Sales by Product Category',
-            color='Category',
-            template="plotly_white"
-        )
-        st.plotly_chart(fig_sales_category, use_container_width=True)
-
+        st.plotly_chart(figs['sales_category'], use_container_width=True)
     with col5:
-        profit_by_sub_category = df_filtered.groupby('Sub-Category')['Profit'].sum().reset_index().sort_values(by='Profit', ascending=False)
-        fig_profit_sub_category = px.bar(
-            profit_by_sub_category,
-            x='Sub-Category',
-            y='Profit',
-            title='Profit by Product Sub-Category',
-            color='Profit', # Color by profit value
-            template="plotly_white",
-            color_continuous_scale="RdYlGn" # Fixed: Use string name for RdYlGn
-        )
-        st.plotly_chart(fig_profit_sub_category, use_container_width=True)
+        st.plotly_chart(figs['profit_sub_category'], use_container_width=True)
 
     # 3. Sales vs. Profit Scatter Plot
     st.markdown("#### Sales vs. Profit per Order")
-    fig_scatter = px.scatter(
-        df_filtered,
-        x='Sales',
-        y='Profit',
-        color='Category',
-        hover_data=['Product Name', 'Customer Name', 'Order ID', 'Order Date'], # Added Order ID
-        title='Sales vs. Profit',
-        labels={'Sales': 'Sales Amount', 'Profit': 'Profit Amount'},
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    st.plotly_chart(figs['scatter'], use_container_width=True)
 
     # 4. Sales by Region and Segment
     st.markdown("#### Sales Distribution by Region & Customer Segment")
     col6, col7 = st.columns(2)
     with col6:
-        sales_by_region = df_filtered.groupby('Region')['Sales'].sum().reset_index()
-        fig_sales_region = px.pie(
-            sales_by_region,
-            values='Sales',
-            names='Region',
-            title='Sales Distribution by Region',
-            hole=0.3, # Donut chart
-            template="plotly_white"
-        )
-        fig_sales_region.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_sales_region, use_container_width=True)
-
+        st.plotly_chart(figs['sales_region'], use_container_width=True)
     with col7:
-        sales_by_segment = df_filtered.groupby('Segment')['Sales'].sum().reset_index()
-        fig_sales_segment = px.bar(
-            sales_by_segment,
-            x='Segment',
-            y='Sales',
-            title='Sales by Customer Segment',
-            color='Segment',
-            template="plotly_white"
-        )
-        st.plotly_chart(fig_sales_segment, use_container_width=True)
+        st.plotly_chart(figs['sales_segment'], use_container_width=True)
 
     # 5. Sales by State
     st.markdown("#### Sales by State")
-    sales_by_state = df_filtered.groupby('State')['Sales'].sum().reset_index().sort_values(by='Sales', ascending=False)
-    fig_sales_state = px.bar(
-        sales_by_state.head(20), # Show top 20 states
-        x='State',
-        y='Sales',
-        title='Top 20 States by Sales',
-        color='Sales',
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_sales_state, use_container_width=True)
+    st.plotly_chart(figs['sales_state'], use_container_width=True)
 
     st.markdown("---") # Markdown for separation
     st.subheader("Filtered Raw Data")
 
     # --- Display Raw Data (optional) ---
     if st.checkbox("Show Raw Data"):
-        st.dataframe(df_filtered)
+        # Hide the precomputed helper columns from the raw view
+        st.dataframe(df_filtered.drop(columns=['_month_idx', '_hover']))
 
 st.caption("Dashboard created with Streamlit and Plotly Express.")
 